@@ -2,6 +2,7 @@
 # This software may be modified and distributed under the terms of the
 # Released under the terms of the BSD 3-Clause License
 
+import sys
 import time
 import math
 import h5py
@@ -81,7 +82,11 @@ class SignalProvider(QThread):
                 level_ref = value["data"]["level"]
                 text_ref = value["data"]["text"]
 
-                data[key]["timestamps"] = np.squeeze(np.array(value["timestamps"]))
+                # the timestamps are searched with np.searchsorted, hence they must
+                # be a 1d array also when the log contains a single message
+                data[key]["timestamps"] = np.atleast_1d(
+                    np.squeeze(np.array(value["timestamps"]))
+                )
 
                 # New way to store the struct array in robometry https://github.com/robotology/robometry/pull/175
                 if text_ref.shape[0] == len(data[key]["timestamps"]):
@@ -139,10 +144,12 @@ class SignalProvider(QThread):
                     self.end_time = self.timestamps[-1]
 
                 # In yarp telemetry v0.4.0 the elements_names was saved.
+                # The same names (e.g. the joints) are shared by many signals, so
+                # they are interned to keep a single copy of each of them.
                 if "elements_names" in value.keys():
                     elements_names_ref = value["elements_names"]
                     data[key]["elements_names"] = [
-                        "".join(chr(c[0]) for c in value[ref])
+                        sys.intern("".join(chr(c[0]) for c in value[ref]))
                         for ref in elements_names_ref[0]
                     ]
             else:
@@ -167,7 +174,8 @@ class SignalProvider(QThread):
 
             joint_ref = root_variable["description_list"]
             self.joints_name = [
-                "".join(chr(c[0]) for c in file[ref]) for ref in joint_ref[0]
+                sys.intern("".join(chr(c[0]) for c in file[ref]))
+                for ref in joint_ref[0]
             ]
             if "yarp_robot_name" in root_variable.keys():
                 robot_name_ref = root_variable["yarp_robot_name"]
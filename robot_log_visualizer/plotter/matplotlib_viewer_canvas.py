@@ -189,7 +189,7 @@ class MatplotlibViewerCanvas(FigureCanvas):
             path_string = "/".join(path)
             legend_string = "/".join(legend[1:])
 
-            if path_string not in self.active_paths.keys():
+            if path_string not in self.active_paths:
                 data = self.signal_provider.data
                 for key in path[:-1]:
                     data = data[key]
@@ -219,12 +219,12 @@ class MatplotlibViewerCanvas(FigureCanvas):
                         marker="o",
                     )
 
-        paths_to_be_canceled = []
-        for active_path in self.active_paths.keys():
-            path = active_path.split("/")
-
-            if path not in paths:
-                paths_to_be_canceled.append(active_path)
+        selected_paths = {"/".join(path) for path in paths}
+        paths_to_be_canceled = [
+            active_path
+            for active_path in self.active_paths.keys()
+            if active_path not in selected_paths
+        ]
 
         for path in paths_to_be_canceled:
             self.active_paths[path].remove()
@@ -198,7 +198,7 @@ class MeshcatProvider(QThread):
                     trajectory_path,
                     trajectory,
                 ) in self._signal_provider.get_3d_trajectory_at_index(index).items():
-                    if trajectory_path not in self._registered_3d_trajectories.keys():
+                    if trajectory_path not in self._registered_3d_trajectories:
                         continue
 
                     if self._registered_3d_trajectories[trajectory_path][0]:
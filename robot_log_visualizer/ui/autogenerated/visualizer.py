@@ -199,28 +199,12 @@ class Ui_MainWindow(object):
         self.tab_5.setObjectName("tab_5")
         self.verticalLayout_2 = QtWidgets.QVBoxLayout(self.tab_5)
         self.verticalLayout_2.setObjectName("verticalLayout_2")
-        self.logScrollArea = QtWidgets.QScrollArea(self.tab_5)
-        self.logScrollArea.setMinimumSize(QtCore.QSize(0, 120))
-        self.logScrollArea.setAutoFillBackground(False)
-        self.logScrollArea.setStyleSheet("background: white")
-        self.logScrollArea.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAsNeeded)
-        self.logScrollArea.setSizeAdjustPolicy(QtWidgets.QAbstractScrollArea.AdjustToContents)
-        self.logScrollArea.setWidgetResizable(True)
-        self.logScrollArea.setObjectName("logScrollArea")
-        self.logScrollAreaWidgetContents = QtWidgets.QWidget()
-        self.logScrollAreaWidgetContents.setGeometry(QtCore.QRect(0, 0, 860, 190))
-        self.logScrollAreaWidgetContents.setObjectName("logScrollAreaWidgetContents")
-        self.gridLayout = QtWidgets.QGridLayout(self.logScrollAreaWidgetContents)
-        self.gridLayout.setObjectName("gridLayout")
-        spacerItem = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
-        self.gridLayout.addItem(spacerItem, 2, 0, 1, 1)
-        self.logLabel = QtWidgets.QLabel(self.logScrollAreaWidgetContents)
-        self.logLabel.setCursor(QtGui.QCursor(QtCore.Qt.ArrowCursor))
-        self.logLabel.setText("")
-        self.logLabel.setObjectName("logLabel")
-        self.gridLayout.addWidget(self.logLabel, 1, 0, 1, 1)
-        self.logScrollArea.setWidget(self.logScrollAreaWidgetContents)
-        self.verticalLayout_2.addWidget(self.logScrollArea)
+        self.logPlainTextEdit = QtWidgets.QPlainTextEdit(self.tab_5)
+        self.logPlainTextEdit.setMinimumSize(QtCore.QSize(0, 120))
+        self.logPlainTextEdit.setStyleSheet("background: white")
+        self.logPlainTextEdit.setReadOnly(True)
+        self.logPlainTextEdit.setObjectName("logPlainTextEdit")
+        self.verticalLayout_2.addWidget(self.logPlainTextEdit)
         icon = QtGui.QIcon.fromTheme("document")
         self.tabWidget.addTab(self.tab_5, icon, "")
         self.verticalLayout.addWidget(self.splitter_2)
@@ -4,8 +4,8 @@
 
 # PyQt5
 from PyQt5 import QtWidgets, QtGui
-from PyQt5.QtCore import QUrl
-from PyQt5.QtCore import pyqtSlot, Qt, QMutex, QMutexLocker
+from PyQt5.QtCore import QUrl, QTimer
+from PyQt5.QtCore import pyqtSlot, Qt, QSignalBlocker
 from PyQt5.QtWidgets import (
     QFileDialog,
     QTreeWidgetItem,
@@ -33,6 +33,7 @@ import sys
 import os
 import pathlib
 import re
+import functools
 
 import numpy as np
 
@@ -111,7 +112,10 @@ def build_plot_title_box_dialog():
     return dlg, line_edit
 
 
+@functools.lru_cache(maxsize=None)
 def get_icon(icon_name):
+    # QIcon is implicitly shared, so the same instance can be safely returned to
+    # every caller. This avoids decoding the same file from disk more than once.
     icon = QtGui.QIcon()
     icon.addPixmap(
         QtGui.QPixmap(str(pathlib.Path(__file__).parent / "misc" / icon_name)),
@@ -121,7 +125,43 @@ def get_icon(icon_name):
     return icon
 
 
+# QBrush is implicitly shared, so the brushes used to highlight the items of the
+# variable tree are created only once
+_selected_base_brush = QtGui.QBrush(QtGui.QColor(255, 0, 0, 127))
+_deselected_base_brush = QtGui.QBrush(QtGui.QColor(0, 0, 0, 0))
+_default_foreground_brush = QtGui.QBrush(QtGui.QColor(0, 0, 0))
+
+
+@functools.lru_cache(maxsize=None)
+def get_brush(hex_color):
+    return QtGui.QBrush(QtGui.QColor(hex_color))
+
+
+# prototypes of the leaves of the variable tree. Many leaves share the same name
+# (e.g. "Element 0"), so they are cloned instead of being built from scratch
+_leaf_item_prototypes = {}
+
+
+def get_leaf_item(name):
+    prototype = _leaf_item_prototypes.get(name)
+    if prototype is None:
+        prototype = QTreeWidgetItem([name])
+        _leaf_item_prototypes[name] = prototype
+    return prototype.clone()
+
+
 class RobotViewerMainWindow(QtWidgets.QMainWindow):
+    # text of the actions of the variable tree context menu
+    ADD_3D_POINT_STR = "Show as a 3D point"
+    ADD_3D_TRAJECTORY_STR = "Show as a 3D trajectory"
+    REMOVE_3D_POINT_STR = "Remove the 3D point"
+    REMOVE_3D_TRAJECTORY_STR = "Remove the 3D trajectory"
+    USE_AS_BASE_POSITION_STR = "Use as base position"
+    USE_AS_BASE_ORIENTATION_RPY_STR = "Use as base orientation (Roll-Pitch-Yaw)"
+    USE_AS_BASE_ORIENTATION_QUATERNION_STR = "Use as base orientation (xyzw Quaternion)"
+    DONT_USE_AS_BASE_POSITION_STR = "Don't use as base position"
+    DONT_USE_AS_BASE_ORIENTATION_STR = "Don't use as base orientation"
+
     def __init__(self, signal_provider, meshcat_provider, animation_period):
         # call QMainWindow constructor
         super().__init__()
@@ -135,7 +175,6 @@ class RobotViewerMainWindow(QtWidgets.QMainWindow):
         # Set all the icons
         self.ui.startButton.setIcon(get_icon("play-outline.svg"))
         self.ui.pauseButton.setIcon(get_icon("pause-outline.svg"))
-        self.ui.pauseButton.setIcon(get_icon("pause-outline.svg"))
         self.ui.meshcatAndVideoTab.setTabIcon(
             0, get_icon("game-controller-outline.svg")
         )
@@ -143,7 +182,6 @@ class RobotViewerMainWindow(QtWidgets.QMainWindow):
         self.ui.tabWidget.setTabIcon(1, get_icon("terminal-outline.svg"))
         self.ui.tabWidget.setTabIcon(2, get_icon("document-text-outline.svg"))
 
-        self.ui.actionQuit.setIcon(get_icon("close-circle-outline.svg"))
         self.ui.actionQuit.setIcon(get_icon("close-circle-outline.svg"))
         self.ui.actionOpen.setIcon(get_icon("folder-open-outline.svg"))
         self.ui.actionSet_Robot_Model.setIcon(get_icon("body-outline.svg"))
@@ -164,21 +202,69 @@ class RobotViewerMainWindow(QtWidgets.QMainWindow):
 
         self.plot_items = []
         self.video_items = []
+        # maximum drift (in ms) between a playing video and the dataset
+        self.video_max_drift = 100
         self.visualized_3d_points = set()
         self.visualized_3d_trajectories = set()
         self.visualized_3d_points_colors_palette = ColorPalette()
 
+        # handlers of the actions of the variable tree context menu. The 3d points
+        # and the 3d trajectories are handled in the same way, only the functions
+        # and the set of the visualized items differ
+        self.variable_tree_actions = {
+            self.ADD_3D_POINT_STR: functools.partial(
+                self.__add_3d_item,
+                self.meshcat_provider.register_3d_point,
+                self.signal_provider.register_3d_point,
+                self.visualized_3d_points,
+            ),
+            self.ADD_3D_TRAJECTORY_STR: functools.partial(
+                self.__add_3d_item,
+                self.meshcat_provider.register_3d_trajectory,
+                self.signal_provider.register_3d_trajectory,
+                self.visualized_3d_trajectories,
+            ),
+            self.REMOVE_3D_POINT_STR: functools.partial(
+                self.__remove_3d_item,
+                self.meshcat_provider.unregister_3d_point,
+                self.signal_provider.unregister_3d_point,
+                self.visualized_3d_points,
+            ),
+            self.REMOVE_3D_TRAJECTORY_STR: functools.partial(
+                self.__remove_3d_item,
+                self.meshcat_provider.unregister_3d_trajectory,
+                self.signal_provider.unregister_3d_trajectory,
+                self.visualized_3d_trajectories,
+            ),
+            self.USE_AS_BASE_POSITION_STR: self.__use_as_base_position,
+            self.USE_AS_BASE_ORIENTATION_RPY_STR: self.__use_as_base_orientation,
+            self.USE_AS_BASE_ORIENTATION_QUATERNION_STR: self.__use_as_base_orientation,
+            self.DONT_USE_AS_BASE_POSITION_STR: self.__dont_use_as_base_position,
+            self.DONT_USE_AS_BASE_ORIENTATION_STR: self.__dont_use_as_base_orientation,
+        }
+
+        # leaves of the variable tree indexed by their path joined with "/"
+        self.variable_tree_leaves = {}
+        # inner nodes of the variable tree indexed by their path (see get_item_path)
+        self.variable_tree_nodes = {}
+
         self.toolButton_on_click()
 
         # instantiate the Logger
-        self.logger = Logger(self.ui.logLabel, self.ui.logScrollArea)
+        self.logger = Logger(self.ui.logPlainTextEdit)
         # print welcome message
         self.logger.write_to_log("Robot Viewer started.")
 
         self.text_logger = TextLoggingItem(self.ui.yarpTextLogTableWidget)
 
-        self._slider_pressed_mutex = QMutex()
-        self._slider_pressed = False
+        # path and timestamps of the selected text log. They are updated only when
+        # the selection changes so that they are not recomputed at every frame
+        self._text_log_item_path = None
+        self._text_log_timestamps = None
+
+        # the slider state is accessed only from the GUI thread (update_index is
+        # invoked through a queued signal), hence no lock is required
+        self.slider_pressed = False
 
         self.dataset_loaded = False
 
@@ -188,9 +274,8 @@ class RobotViewerMainWindow(QtWidgets.QMainWindow):
         self.ui.actionAbout.triggered.connect(self.open_about)
         self.ui.actionSet_Robot_Model.triggered.connect(self.open_set_robot_model)
 
-        self.ui.meshcatView.setUrl(
-            QUrl(meshcat_provider._meshcat_visualizer.viewer.url())
-        )
+        # the meshcat page is loaded once the window is shown (see showEvent)
+        self.meshcat_view_loaded = False
 
         self.ui.pauseButton.clicked.connect(self.pauseButton_on_click)
         self.ui.startButton.clicked.connect(self.startButton_on_click)
@@ -198,10 +283,25 @@ class RobotViewerMainWindow(QtWidgets.QMainWindow):
         self.ui.timeSlider.sliderPressed.connect(self.timeSlider_on_pressed)
         self.ui.timeSlider.sliderMoved.connect(self.timeSlider_on_sliderMoved)
 
+        self._slider_moved_timer = QTimer(self)
+        self._slider_moved_timer.setSingleShot(True)
+        self._slider_moved_timer.setInterval(16)
+        self._slider_moved_timer.timeout.connect(self.timeSlider_update_position)
+
+        # the index updates emitted by the signal provider are coalesced as well, so
+        # that the widgets are refreshed at most once per timer interval
+        self._update_index_timer = QTimer(self)
+        self._update_index_timer.setSingleShot(True)
+        self._update_index_timer.setInterval(16)
+        self._update_index_timer.timeout.connect(self.apply_index_update)
+
         self.ui.variableTreeWidget.itemClicked.connect(self.variableTreeWidget_on_click)
         self.ui.yarpTextLogTreeWidget.itemClicked.connect(
             self.textLogTreeWidget_on_click
         )
+        self.ui.yarpTextLogTreeWidget.itemSelectionChanged.connect(
+            self.textLogTreeWidget_on_selection_changed
+        )
 
         self.ui.tabPlotWidget.tabCloseRequested.connect(
             self.plotTabCloseButton_on_click
@@ -219,6 +319,23 @@ class RobotViewerMainWindow(QtWidgets.QMainWindow):
 
         self.robot_state_path = RobotStatePath()
 
+        # the python console and its interpreter thread are created the first time
+        # the console tab is shown, so that they do not slow down the startup
+        self.pyconsole = None
+        self.ui.tabWidget.currentChanged.connect(self.tabWidget_on_currentChanged)
+
+        # self.media_player = QMediaPlayer(None, QMediaPlayer.VideoSurface)
+        # self.media_player.setVideoOutput(self.ui.webcamView)
+        # self.media_loaded = False
+
+    def tabWidget_on_currentChanged(self, index):
+        if (
+            self.pyconsole is None
+            and self.ui.tabWidget.widget(index) is self.ui.pythonWidget
+        ):
+            self.create_pyconsole()
+
+    def create_pyconsole(self):
         self.pyconsole = PythonConsole(
             parent=self.ui.pythonWidget,
             formats={
@@ -239,20 +356,22 @@ class RobotViewerMainWindow(QtWidgets.QMainWindow):
         self.ui.pythonWidgetLayout.addWidget(self.pyconsole)
         self.pyconsole.eval_in_thread()
 
-        # self.media_player = QMediaPlayer(None, QMediaPlayer.VideoSurface)
-        # self.media_player.setVideoOutput(self.ui.webcamView)
-        # self.media_loaded = False
+        if self.dataset_loaded:
+            self.pyconsole.push_local_ns("data", self.signal_provider.data)
+
+    def showEvent(self, event):
+        super().showEvent(event)
 
-    @property
-    def slider_pressed(self):
-        locker = QMutexLocker(self._slider_pressed_mutex)
-        value = self._slider_pressed
-        return value
+        # loading the meshcat page is expensive, so it is done after the window has
+        # been painted for the first time
+        if not self.meshcat_view_loaded:
+            self.meshcat_view_loaded = True
+            QTimer.singleShot(0, self.load_meshcat_view)
 
-    @slider_pressed.setter
-    def slider_pressed(self, slider_pressed):
-        locker = QMutexLocker(self._slider_pressed_mutex)
-        self._slider_pressed = slider_pressed
+    def load_meshcat_view(self):
+        self.ui.meshcatView.setUrl(
+            QUrl(self.meshcat_provider._meshcat_visualizer.viewer.url())
+        )
 
     def keyPressEvent(self, event):
         if not self.dataset_loaded:
@@ -260,48 +379,27 @@ class RobotViewerMainWindow(QtWidgets.QMainWindow):
 
         if event.modifiers() & Qt.ControlModifier:
             if event.key() == Qt.Key_B:
-                self.slider_pressed = True
-                new_index = int(self.ui.timeSlider.value()) - 1
-                dataset_percentage = float(new_index) / float(
-                    self.ui.timeSlider.maximum()
-                )
-                self.signal_provider.set_dataset_percentage(dataset_percentage)
-                self.ui.timeLabel.setText(f"{self.signal_provider.current_time:.2f}")
-                self.text_logger.highlight_cell(
-                    self.find_text_log_index(self.get_text_log_item_path())
-                )
-
-                # for every video item we set the instant
-                for video_item in self.video_items:
-                    if video_item.media_loaded:
-                        video_item.media_player.setPosition(
-                            int(dataset_percentage * video_item.media_player.duration())
-                        )
-
-                # update the time slider
-                self.ui.timeSlider.setValue(new_index)
-                self.slider_pressed = False
+                self.move_index(-1)
             elif event.key() == Qt.Key_F:
-                self.slider_pressed = True
-                new_index = int(self.ui.timeSlider.value()) + 1
-                dataset_percentage = float(new_index) / float(
-                    self.ui.timeSlider.maximum()
-                )
-                self.signal_provider.set_dataset_percentage(dataset_percentage)
-                self.ui.timeLabel.setText(f"{self.signal_provider.current_time:.2f}")
-                self.text_logger.highlight_cell(
-                    self.find_text_log_index(self.get_text_log_item_path())
-                )
+                self.move_index(1)
 
-                # for every video item we set the instant
-                for video_item in self.video_items:
-                    if video_item.media_loaded:
-                        video_item.media_player.setPosition(
-                            int(dataset_percentage * video_item.media_player.duration())
-                        )
+    def move_index(self, delta):
+        self.slider_pressed = True
+        new_index = min(
+            max(int(self.ui.timeSlider.value()) + delta, 0),
+            self.ui.timeSlider.maximum(),
+        )
+        # the index is set directly, without going through the dataset percentage
+        self.signal_provider.update_index(new_index)
+        self.ui.timeLabel.setText(f"{self.signal_provider.current_time:.2f}")
+        self.text_logger.highlight_cell(self.find_text_log_index())
 
-                self.ui.timeSlider.setValue(new_index)
-                self.slider_pressed = False
+        # for every video item we set the instant
+        self.sync_video_items(float(new_index) / float(self.ui.timeSlider.maximum()))
+
+        # update the time slider
+        self.ui.timeSlider.setValue(new_index)
+        self.slider_pressed = False
 
     def toolButton_on_click(self):
         self.plot_items.append(
@@ -318,36 +416,25 @@ class RobotViewerMainWindow(QtWidgets.QMainWindow):
         self.slider_pressed = True
 
     def timeSlider_on_sliderMoved(self):
+        # the slider may emit many events while it is dragged. They are coalesced
+        # so that the dataset is updated at most once per timer interval
+        if not self._slider_moved_timer.isActive():
+            self._slider_moved_timer.start()
+
+    def timeSlider_update_position(self):
         index = int(self.ui.timeSlider.value())
         dataset_percentage = float(index) / float(self.ui.timeSlider.maximum())
 
-        for video_item in self.video_items:
-            if video_item.media_loaded:
-                video_item.media_player.setPosition(
-                    int(dataset_percentage * video_item.media_player.duration())
-                )
+        self.sync_video_items(dataset_percentage)
 
         self.signal_provider.set_dataset_percentage(dataset_percentage)
         self.ui.timeLabel.setText(f"{self.signal_provider.current_time:.2f}")
-        self.text_logger.highlight_cell(
-            self.find_text_log_index(self.get_text_log_item_path())
-        )
+        self.text_logger.highlight_cell(self.find_text_log_index())
 
     def timeSlider_on_release(self):
-        index = int(self.ui.timeSlider.value())
-        dataset_percentage = float(index) / float(self.ui.timeSlider.maximum())
-
-        for video_item in self.video_items:
-            if video_item.media_loaded:
-                video_item.media_player.setPosition(
-                    int(dataset_percentage * video_item.media_player.duration())
-                )
-
-        self.signal_provider.set_dataset_percentage(dataset_percentage)
-        self.ui.timeLabel.setText(f"{self.signal_provider.current_time:.2f}")
-        self.text_logger.highlight_cell(
-            self.find_text_log_index(self.get_text_log_item_path())
-        )
+        # the pending update is not needed since the position is set here
+        self._slider_moved_timer.stop()
+        self.timeSlider_update_position()
         self.slider_pressed = False
 
     def startButton_on_click(self):
@@ -356,6 +443,11 @@ class RobotViewerMainWindow(QtWidgets.QMainWindow):
         self.signal_provider.state = PeriodicThreadState.running
         # self.meshcat_provider.state = PeriodicThreadState.running
 
+        # the videos are played and they are seeked only when they drift
+        for video_item in self.video_items:
+            if video_item.media_loaded:
+                video_item.media_player.play()
+
         self.logger.write_to_log("Dataset started.")
 
     def pauseButton_on_click(self):
@@ -366,6 +458,12 @@ class RobotViewerMainWindow(QtWidgets.QMainWindow):
             if video_item.media_loaded:
                 video_item.media_player.pause()
 
+        # while playing the videos may drift from the dataset up to video_max_drift,
+        # so they are aligned to the dataset once they are paused
+        self.sync_video_items(
+            float(self.ui.timeSlider.value()) / float(self.ui.timeSlider.maximum())
+        )
+
         self.signal_provider.state = PeriodicThreadState.pause
         # self.meshcat_provider.state = PeriodicThreadState.pause
 
@@ -387,22 +485,9 @@ class RobotViewerMainWindow(QtWidgets.QMainWindow):
     def variableTreeWidget_on_click(self):
         paths = []
         legends = []
-        for index in self.ui.variableTreeWidget.selectedIndexes():
-            path = []
-            legend = []
-            is_leaf = True
-            while index.data() is not None:
-                legend.append(index.data())
-                if not is_leaf:
-                    path.append(index.data())
-                else:
-                    path.append(str(index.row()))
-                    is_leaf = False
-
-                index = index.parent()
-            path.reverse()
-            legend.reverse()
-
+        for item in self.ui.variableTreeWidget.selectedItems():
+            # the path and the legend are stored in the item when the tree is populated
+            path, legend = item.data(0, Qt.UserRole)
             paths.append(path)
             legends.append(legend)
 
@@ -410,29 +495,34 @@ class RobotViewerMainWindow(QtWidgets.QMainWindow):
         if not paths:
             return
 
-        self.plot_items[self.ui.tabPlotWidget.currentIndex()].canvas.update_plots(
-            paths, legends
-        )
+        canvas = self.plot_items[self.ui.tabPlotWidget.currentIndex()].canvas
 
-    def find_text_log_index(self, path):
-        current_time = self.signal_provider.current_time
-        initial_time = self.signal_provider.initial_time
+        # if the selection did not change the plots are already up to date
+        if {"/".join(path) for path in paths} == canvas.active_paths.keys():
+            return
 
-        path = self.get_text_log_item_path()
-        if path:
-            ref = self.signal_provider.text_logging_data
-            for key in path:
-                ref = ref[key]
+        canvas.update_plots(paths, legends)
 
-            s = np.flatnonzero(ref["timestamps"] <= current_time + initial_time)
-            if len(s) == 1:
-                return s[0]
-            elif not s.any():
-                return None
-            else:
-                return s[-1]
+    def find_text_log_index(self):
+        if self._text_log_timestamps is None:
+            return None
 
-        return None
+        current_time = self.signal_provider.current_time
+        initial_time = self.signal_provider.initial_time
+
+        # the timestamps are sorted, so we look for the last entry that is not
+        # greater than the current time with a binary search
+        index = (
+            int(
+                np.searchsorted(
+                    self._text_log_timestamps,
+                    current_time + initial_time,
+                    side="right",
+                )
+            )
+            - 1
+        )
+        return index if index >= 0 else None
 
     def show_text_log(self, path):
         initial_time = self.signal_provider.initial_time
@@ -441,39 +531,37 @@ class RobotViewerMainWindow(QtWidgets.QMainWindow):
             ref = ref[key]
 
         self.text_logger.clean()
-        logs = ref["data"]
-        timestamps = ref["timestamps"]
-        for i in range(len(ref["data"])):
-            self.text_logger.add_entry(
-                logs[i].text, timestamps[i] - initial_time, font_color=logs[i].color()
-            )
+
+        # the relative timestamps are computed at once with numpy
+        timestamps = (np.asarray(ref["timestamps"]) - initial_time).tolist()
+
+        self.text_logger.add_entries(
+            [log.text for log in ref["data"]],
+            timestamps,
+            [log.color() for log in ref["data"]],
+        )
 
     def get_text_log_item_path(self):
-        paths = []
-        for index in self.ui.yarpTextLogTreeWidget.selectedIndexes():
-            path = []
-            is_leaf = True
-            while index.data() is not None:
-                if not is_leaf:
-                    path.append(index.data())
-                else:
-                    path.append(index.data())
-                    is_leaf = False
+        # the path is stored in the item when the tree is populated
+        for item in self.ui.yarpTextLogTreeWidget.selectedItems():
+            return item.data(0, Qt.UserRole)
+        return None
 
-                index = index.parent()
+    def textLogTreeWidget_on_selection_changed(self):
+        self._text_log_item_path = self.get_text_log_item_path()
+        self._text_log_timestamps = None
 
-            path.reverse()
-            paths.append(path)
-        if paths:
-            return paths[0]
-        else:
-            return None
+        if self._text_log_item_path:
+            ref = self.signal_provider.text_logging_data
+            for key in self._text_log_item_path:
+                ref = ref[key]
+            self._text_log_timestamps = ref["timestamps"]
 
     def textLogTreeWidget_on_click(self):
-        path = self.get_text_log_item_path()
+        path = self._text_log_item_path
         if path:
             self.show_text_log(path)
-            self.text_logger.highlight_cell(self.find_text_log_index(path))
+            self.text_logger.highlight_cell(self.find_text_log_index())
 
     def plotTabBar_currentChanged(self, index):
         # pause all the animations except the one that is selected, this is done to avoid the overhead of the animations
@@ -486,45 +574,59 @@ class RobotViewerMainWindow(QtWidgets.QMainWindow):
         # clear the selection to prepare a new one
         self.ui.variableTreeWidget.clearSelection()
         for active_path_str in self.plot_items[index].canvas.active_paths.keys():
-            path = active_path_str.split("/")
-
             # select the item in the tree from the path
-            item = self.ui.variableTreeWidget.topLevelItem(0)
-            for subpath in path[1:-1]:
-                # find the item given its name
-                for child_id in range(item.childCount()):
-                    if item.child(child_id).text(0) == subpath:
-                        item = item.child(child_id)
-                        break
-
-            # the latest value is a number
-            item = item.child(int(path[-1]))
-            item.setSelected(True)
+            item = self.variable_tree_leaves.get(active_path_str)
+            if item is not None:
+                item.setSelected(True)
 
     @pyqtSlot()
     def update_index(self):
+        if not self._update_index_timer.isActive():
+            self._update_index_timer.start()
+
+    def apply_index_update(self):
         if self.slider_pressed:
             return
 
-        self.ui.timeSlider.setValue(self.signal_provider.index)
+        # the slider is updated programmatically, so its signals are not emitted
+        with QSignalBlocker(self.ui.timeSlider):
+            self.ui.timeSlider.setValue(self.signal_provider.index)
         self.ui.timeLabel.setText(f"{self.signal_provider.current_time:.2f}")
-        self.text_logger.highlight_cell(
-            self.find_text_log_index(self.get_text_log_item_path())
-        )
+        self.text_logger.highlight_cell(self.find_text_log_index())
 
         # TODO: this is a hack to update the video player and it should be done only for the activated videos
+        video_percentage = float(self.ui.timeSlider.value()) / float(
+            self.ui.timeSlider.maximum()
+        )
+        self.sync_video_items(video_percentage)
+
+    def sync_video_items(self, percentage):
+        # the position of a paused video is updated only if it differs from the
+        # current one by at least one animation period. This avoids seeking the
+        # media backend at every frame when the position did not change
+        threshold = self.animation_period * 1000
         for video_item in self.video_items:
-            if video_item.media_loaded:
-                video_percentage = float(self.ui.timeSlider.value()) / float(
-                    self.ui.timeSlider.maximum()
-                )
-                video_item.media_player.setPosition(
-                    int(video_percentage * video_item.media_player.duration())
-                )
+            if not video_item.media_loaded:
+                continue
+
+            position = int(percentage * video_item.duration)
+            if video_item.media_player.state() == QMediaPlayer.PlayingState:
+                # a playing video runs at its own rate and it is moved only if it
+                # drifts too much from the dataset
+                if (
+                    abs(position - video_item.media_player.position())
+                    < self.video_max_drift
+                ):
+                    continue
+            elif abs(position - video_item.media_player.position()) < threshold:
+                continue
+
+            video_item.media_player.setPosition(position)
 
     def closeEvent(self, event):
         # close the window
-        self.pyconsole.close()
+        if self.pyconsole is not None:
+            self.pyconsole.close()
         for video_item in self.video_items:
             del video_item.media_player
 
@@ -536,48 +638,90 @@ class RobotViewerMainWindow(QtWidgets.QMainWindow):
 
         event.accept()
 
-    def __populate_variable_tree_widget(self, obj, parent) -> QTreeWidgetItem:
-        if not isinstance(obj, dict):
-            return parent
-        if "data" in obj.keys() and "timestamps" in obj.keys():
-            temp_array = obj["data"]
-            try:
-                n_cols = temp_array.shape[1]
-            except IndexError:
-                # This happens in the case the variable is a scalar.
-                n_cols = 1
-
-            # In yarp telemetry v0.4.0 the elements_names was saved.
-            if "elements_names" in obj.keys():
-                for name in obj["elements_names"]:
-                    item = QTreeWidgetItem([name])
-                    parent.addChild(item)
-            else:
-                for i in range(n_cols):
-                    item = QTreeWidgetItem(["Element " + str(i)])
-                    parent.addChild(item)
-            return parent
-        for key, value in obj.items():
-            item = QTreeWidgetItem([key])
-            item = self.__populate_variable_tree_widget(value, item)
-            item.setFlags(item.flags() & ~Qt.ItemIsSelectable)
-            parent.addChild(item)
-        return parent
-
-    def __populate_text_logging_tree_widget(self, obj, parent) -> QTreeWidgetItem:
-        if not isinstance(obj, dict):
-            return parent
-
-        if "data" in obj.keys() and "timestamps" in obj.keys():
-            return parent
-
-        for key, value in obj.items():
-            item = QTreeWidgetItem([key])
-            item = self.__populate_text_logging_tree_widget(value, item)
-            if "data" not in value.keys():
+    def __populate_variable_tree_widget(self, obj, root, path) -> QTreeWidgetItem:
+        # the tree is visited with an explicit stack instead of recursion
+        stack = [(obj, root, path)]
+        while stack:
+            obj, parent, path = stack.pop()
+            if not isinstance(obj, dict):
+                continue
+            if "data" in obj and "timestamps" in obj:
+                temp_array = obj["data"]
+                try:
+                    n_cols = temp_array.shape[1]
+                except IndexError:
+                    # This happens in the case the variable is a scalar.
+                    n_cols = 1
+
+                # In yarp telemetry v0.4.0 the elements_names was saved.
+                if "elements_names" in obj:
+                    names = obj["elements_names"]
+                else:
+                    names = [f"Element {i}" for i in range(n_cols)]
+
+                # Each leaf stores the path of the signal (where the last element is
+                # the column index) and the legend, so that they do not need to be
+                # computed by walking the tree when the item is selected
+                children = []
+                for i, name in enumerate(names):
+                    item = get_leaf_item(name)
+                    leaf_path = path + [str(i)]
+                    item.setData(0, Qt.UserRole, (leaf_path, path + [name]))
+                    self.variable_tree_leaves["/".join(leaf_path)] = item
+                    children.append(item)
+                parent.addChildren(children)
+                continue
+
+            children = []
+            for key, value in obj.items():
+                item = QTreeWidgetItem([key])
                 item.setFlags(item.flags() & ~Qt.ItemIsSelectable)
-            parent.addChild(item)
-        return parent
+                # the path of the inner nodes does not contain the root. It is stored
+                # in the item and used as key to retrieve the item from the path. The
+                # path joined with "/" is stored as well since it is used as item key
+                node_path = path[1:] + [key]
+                item.setData(0, Qt.UserRole, node_path)
+                item.setData(0, Qt.UserRole + 1, "/".join(node_path))
+                self.variable_tree_nodes[tuple(node_path)] = item
+                children.append(item)
+                stack.append((value, item, path + [key]))
+            parent.addChildren(children)
+        return root
+
+    def __populate_text_logging_tree_widget(self, obj, root, path) -> QTreeWidgetItem:
+        # the tree is visited with an explicit stack instead of recursion
+        stack = [(obj, root, path)]
+        while stack:
+            obj, parent, path = stack.pop()
+            if not isinstance(obj, dict):
+                continue
+
+            if "data" in obj and "timestamps" in obj:
+                continue
+
+            children = []
+            for key, value in obj.items():
+                item = QTreeWidgetItem([key])
+                if "data" not in value:
+                    item.setFlags(item.flags() & ~Qt.ItemIsSelectable)
+                else:
+                    item.setData(0, Qt.UserRole, path + [key])
+                children.append(item)
+                stack.append((value, item, path + [key]))
+            parent.addChildren(children)
+        return root
+
+    @staticmethod
+    def __insert_top_level_item(tree_widget, item):
+        # disable the updates and the signals of the widget while the (possibly
+        # large) tree is inserted, so that it is redrawn only once at the end
+        tree_widget.setUpdatesEnabled(False)
+        tree_widget.blockSignals(True)
+        try:
+            tree_widget.insertTopLevelItems(0, [item])
+        finally:
+            tree_widget.blockSignals(False)
+            tree_widget.setUpdatesEnabled(True)
 
     def __load_mat_file(self, file_name):
         self.signal_provider.open_mat_file(file_name)
@@ -597,55 +741,57 @@ class RobotViewerMainWindow(QtWidgets.QMainWindow):
             self.logger.write_to_log(msg)
 
         # populate tree
-        root = list(self.signal_provider.data.keys())[0]
+        self.variable_tree_leaves = {}
+        self.variable_tree_nodes = {}
+        root = next(iter(self.signal_provider.data))
         root_item = QTreeWidgetItem([root])
         root_item.setFlags(root_item.flags() & ~Qt.ItemIsSelectable)
         items = self.__populate_variable_tree_widget(
-            self.signal_provider.data[root], root_item
+            self.signal_provider.data[root], root_item, [root]
         )
-        self.ui.variableTreeWidget.insertTopLevelItems(0, [items])
+        self.__insert_top_level_item(self.ui.variableTreeWidget, items)
 
         # populate text logging tree
         if self.signal_provider.text_logging_data:
-            root = list(self.signal_provider.text_logging_data.keys())[0]
+            root = next(iter(self.signal_provider.text_logging_data))
             root_item = QTreeWidgetItem([root])
             root_item.setFlags(root_item.flags() & ~Qt.ItemIsSelectable)
             items = self.__populate_text_logging_tree_widget(
-                self.signal_provider.text_logging_data[root], root_item
+                self.signal_provider.text_logging_data[root], root_item, [root]
             )
-            self.ui.yarpTextLogTreeWidget.insertTopLevelItems(0, [items])
+            self.__insert_top_level_item(self.ui.yarpTextLogTreeWidget, items)
 
         # spawn the console
-        self.pyconsole.push_local_ns("data", self.signal_provider.data)
+        if self.pyconsole is not None:
+            self.pyconsole.push_local_ns("data", self.signal_provider.data)
 
         self.ui.timeSlider.setMaximum(self.signal_size)
         self.ui.startButton.setEnabled(True)
         self.ui.timeSlider.setEnabled(True)
 
         # get all the video associated to the datase
-        filename_without_path = pathlib.Path(file_name).name
-        (prefix, sep, suffix) = filename_without_path.rpartition(".")
-
-        video_filenames = [
-            str(pathlib.Path(file_name).parent.absolute() / pathlib.Path(f))
-            for f in os.listdir(pathlib.Path(file_name).parent.absolute())
-            if re.search(prefix + "_[a-zA-Z0-9_]*\.mp4$", f)
-        ]
+        file_path = pathlib.Path(file_name)
+        (prefix, sep, suffix) = file_path.name.rpartition(".")
+
+        video_pattern = re.compile(re.escape(prefix) + r"_([a-zA-Z0-9_]*)\.mp4$")
+        videos = []
+        with os.scandir(file_path.parent.absolute()) as entries:
+            for entry in entries:
+                match = video_pattern.match(entry.name)
+                if match and entry.is_file():
+                    # the label of the video is the name without prefix and extension
+                    videos.append((entry.path, match.group(1)))
 
         # for every video we create a video item and we append it to the tab
-        for video_filename in video_filenames:
-            video_prefix, _, _ = pathlib.Path(video_filename).name.rpartition(".")
-            video_label = str(video_prefix).replace(prefix + "_", "")
-            self.video_items.append(VideoItem(video_filename=video_filename))
-            self.ui.meshcatAndVideoTab.addTab(
-                self.video_items[-1], get_icon("videocam-outline.svg"), video_label
-            )
-            self.logger.write_to_log("Video '" + video_filename + "' opened.")
-
-        # pause all the videos
-        for video_item in self.video_items:
+        video_icon = get_icon("videocam-outline.svg")
+        for video_filename, video_label in videos:
+            video_item = VideoItem(video_filename=video_filename)
+            # the video is paused until the dataset is played
             if video_item.media_loaded:
                 video_item.media_player.pause()
+            self.video_items.append(video_item)
+            self.ui.meshcatAndVideoTab.addTab(video_item, video_icon, video_label)
+            self.logger.write_to_log("Video '" + video_filename + "' opened.")
 
         self.meshcat_provider.state = PeriodicThreadState.running
 
@@ -680,19 +826,23 @@ class RobotViewerMainWindow(QtWidgets.QMainWindow):
             self.meshcat_provider.custom_package_dir = dlg.get_package_directory()
 
     def dropEvent(self, event):
-        if len(event.mimeData().urls()) != 1:
+        urls = event.mimeData().urls()
+        if len(urls) != 1:
             event.ignore()
+            return
 
-        url = event.mimeData().urls()[0].toLocalFile()
-        ext = os.path.splitext(url)[-1].lower()
-        if ext == ".mat":
+        url = urls[0].toLocalFile()
+        if url.lower().endswith(".mat"):
             self.__load_mat_file(url)
             event.accept()
         else:
             event.ignore()
 
     def dragEnterEvent(self, event):
-        if event.mimeData().hasUrls():
+        # only a single .mat file can be dropped. The file name is checked here so
+        # that the drop is not offered for the other files
+        urls = event.mimeData().urls()
+        if len(urls) == 1 and urls[0].fileName().lower().endswith(".mat"):
             event.accept()
         else:
             event.ignore()
@@ -725,157 +875,133 @@ class RobotViewerMainWindow(QtWidgets.QMainWindow):
         # check the number of children
         item_size = item.childCount()
         item_path = self.get_item_path(item)
-        item_key = "/".join(item_path)
+        item_key = self.get_item_key(item)
 
         menu = QtWidgets.QMenu()
 
-        add_3d_point_str = "Show as a 3D point"
-        add_3d_trajectory_str = "Show as a 3D trajectory"
-        remove_3d_point_str = "Remove the 3D point"
-        remove_3d_trajectory_str = "Remove the 3D trajectory"
-        use_as_base_position_str = "Use as base position"
-        use_as_base_orientation_str = "Use as base orientation"
-        dont_use_as_base_position_str = "Don't use as base position"
-        dont_use_as_base_orientation_str = "Don't use as base orientation"
-        selected_base_color = QtGui.QColor(255, 0, 0, 127)
-        deselected_base_color = QtGui.QColor(0, 0, 0, 0)
+        is_3d_point = item_key in self.visualized_3d_points
+        is_3d_trajectory = item_key in self.visualized_3d_trajectories
 
         # in this case we can use the item as 3d point where the z coordinate is set to 0
         if item_size == 2:
-            if item_key in self.visualized_3d_points:
-                menu.addAction(remove_3d_point_str)
-            if item_key in self.visualized_3d_trajectories:
-                menu.addAction(remove_3d_trajectory_str)
-            if (
-                item_key not in self.visualized_3d_points
-                and item_key not in self.visualized_3d_trajectories
-            ):
-                menu.addAction(add_3d_point_str)
-                menu.addAction(add_3d_trajectory_str)
+            if is_3d_point:
+                menu.addAction(self.REMOVE_3D_POINT_STR)
+            if is_3d_trajectory:
+                menu.addAction(self.REMOVE_3D_TRAJECTORY_STR)
+            if not is_3d_point and not is_3d_trajectory:
+                menu.addAction(self.ADD_3D_POINT_STR)
+                menu.addAction(self.ADD_3D_TRAJECTORY_STR)
 
         # in this case we can use the item as base position, base orientation or 3d point
         if item_size == 3:
             if item_path == self.robot_state_path.base_position_path:
-                menu.addAction(dont_use_as_base_position_str)
+                menu.addAction(self.DONT_USE_AS_BASE_POSITION_STR)
             else:
-                menu.addAction(use_as_base_position_str)
+                menu.addAction(self.USE_AS_BASE_POSITION_STR)
 
             if item_path == self.robot_state_path.base_orientation_path:
-                menu.addAction(dont_use_as_base_orientation_str)
+                menu.addAction(self.DONT_USE_AS_BASE_ORIENTATION_STR)
             else:
-                menu.addAction(use_as_base_orientation_str + " (Roll-Pitch-Yaw)")
+                menu.addAction(self.USE_AS_BASE_ORIENTATION_RPY_STR)
 
             menu.addSeparator()
 
-            if item_key in self.visualized_3d_points:
-                menu.addAction(remove_3d_point_str)
-            if item_key in self.visualized_3d_trajectories:
-                menu.addAction(remove_3d_trajectory_str)
-            if (
-                item_key not in self.visualized_3d_points
-                and item_key not in self.visualized_3d_trajectories
-            ):
-                menu.addAction(add_3d_point_str)
-                menu.addAction(add_3d_trajectory_str)
+            if is_3d_point:
+                menu.addAction(self.REMOVE_3D_POINT_STR)
+            if is_3d_trajectory:
+                menu.addAction(self.REMOVE_3D_TRAJECTORY_STR)
+            if not is_3d_point and not is_3d_trajectory:
+                menu.addAction(self.ADD_3D_POINT_STR)
+                menu.addAction(self.ADD_3D_TRAJECTORY_STR)
 
         if item_size == 4:
             if item_path == self.robot_state_path.base_orientation_path:
-                menu.addAction(dont_use_as_base_orientation_str)
+                menu.addAction(self.DONT_USE_AS_BASE_ORIENTATION_STR)
             else:
-                menu.addAction(use_as_base_orientation_str + " (xyzw Quaternion)")
+                menu.addAction(self.USE_AS_BASE_ORIENTATION_QUATERNION_STR)
 
         # show the menu
         action = menu.exec_(self.ui.variableTreeWidget.mapToGlobal(item_position))
         if action is None:
             return
 
-        item_path = self.get_item_path(item)
-
-        if action.text() == add_3d_point_str or action.text() == add_3d_trajectory_str:
-            color = next(self.visualized_3d_points_colors_palette)
-
-            item.setForeground(0, QtGui.QBrush(QtGui.QColor(color.as_hex())))
-
-            if action.text() == add_3d_point_str:
-                self.meshcat_provider.register_3d_point(
-                    item_key, list(color.as_normalized_rgb())
-                )
-                self.signal_provider.register_3d_point(item_key, item_path)
-                self.visualized_3d_points.add(item_key)
-            else:
-                self.meshcat_provider.register_3d_trajectory(
-                    item_key, list(color.as_normalized_rgb())
-                )
-                self.signal_provider.register_3d_trajectory(item_key, item_path)
-                self.visualized_3d_trajectories.add(item_key)
-
-        if action.text() == remove_3d_point_str:
-            self.meshcat_provider.unregister_3d_point(item_key)
-            self.signal_provider.unregister_3d_point(item_key)
-            self.visualized_3d_points.remove(item_key)
-            item.setForeground(0, QtGui.QBrush(QtGui.QColor(0, 0, 0)))
-
-        if action.text() == remove_3d_trajectory_str:
-            self.meshcat_provider.unregister_3d_trajectory(item_key)
-            self.signal_provider.unregister_3d_trajectory(item_key)
-            self.visualized_3d_trajectories.remove(item_key)
-            item.setForeground(0, QtGui.QBrush(QtGui.QColor(0, 0, 0)))
-
-        if (
-            use_as_base_orientation_str in action.text()
-            or action.text() == use_as_base_position_str
-        ):
-            item.setBackground(0, QtGui.QBrush(selected_base_color))
-
-        # check that the action is the one we want
-        if action.text() == use_as_base_position_str:
-            # if base position is already set we remove the color
-            if self.robot_state_path.base_position_path:
-                self.get_item_from_path(
-                    self.robot_state_path.base_position_path
-                ).setBackground(0, QtGui.QBrush(deselected_base_color))
-            self.robot_state_path.base_position_path = item_path
-
-        if use_as_base_orientation_str in action.text():
-            # if base orientation is already set we remove the color
-            if self.robot_state_path.base_orientation_path:
-                self.get_item_from_path(
-                    self.robot_state_path.base_orientation_path
-                ).setBackground(0, QtGui.QBrush(deselected_base_color))
-            self.robot_state_path.base_orientation_path = item_path
-
-        if action.text() == dont_use_as_base_position_str:
-            self.robot_state_path.base_position_path = []
-            # if the item is used as base orientation we do not remove the color
-            if item_path != self.robot_state_path.base_orientation_path:
-                item.setBackground(0, QtGui.QBrush(deselected_base_color))
-
-        if action.text() == dont_use_as_base_orientation_str:
-            self.robot_state_path.base_orientation_path = []
-            # if the item is used as base position we do not remove the color
-            if item_path != self.robot_state_path.base_position_path:
-                item.setBackground(0, QtGui.QBrush(deselected_base_color))
+        self.variable_tree_actions[action.text()](item, item_key, item_path)
 
         # we update the robot state path
         self.signal_provider.robot_state_path = self.robot_state_path
 
+    def __add_3d_item(
+        self, meshcat_register, signal_register, visualized, item, item_key, item_path
+    ):
+        color = next(self.visualized_3d_points_colors_palette)
+
+        item.setForeground(0, get_brush(color.as_hex()))
+
+        meshcat_register(item_key, list(color.as_normalized_rgb()))
+        signal_register(item_key, item_path)
+        visualized.add(item_key)
+
+    def __remove_3d_item(
+        self,
+        meshcat_unregister,
+        signal_unregister,
+        visualized,
+        item,
+        item_key,
+        item_path,
+    ):
+        meshcat_unregister(item_key)
+        signal_unregister(item_key)
+        visualized.remove(item_key)
+        item.setForeground(0, _default_foreground_brush)
+
+    def __use_as_base_position(self, item, item_key, item_path):
+        item.setBackground(0, _selected_base_brush)
+
+        # if base position is already set we remove the color
+        if self.robot_state_path.base_position_path:
+            old_item = self.get_item_from_path(self.robot_state_path.base_position_path)
+            if old_item is not None:
+                old_item.setBackground(0, _deselected_base_brush)
+        self.robot_state_path.base_position_path = item_path
+
+    def __use_as_base_orientation(self, item, item_key, item_path):
+        item.setBackground(0, _selected_base_brush)
+
+        # if base orientation is already set we remove the color
+        if self.robot_state_path.base_orientation_path:
+            old_item = self.get_item_from_path(
+                self.robot_state_path.base_orientation_path
+            )
+            if old_item is not None:
+                old_item.setBackground(0, _deselected_base_brush)
+        self.robot_state_path.base_orientation_path = item_path
+
+    def __dont_use_as_base_position(self, item, item_key, item_path):
+        self.robot_state_path.base_position_path = []
+        # if the item is used as base orientation we do not remove the color
+        if item_path != self.robot_state_path.base_orientation_path:
+            item.setBackground(0, _deselected_base_brush)
+
+    def __dont_use_as_base_orientation(self, item, item_key, item_path):
+        self.robot_state_path.base_orientation_path = []
+        # if the item is used as base position we do not remove the color
+        if item_path != self.robot_state_path.base_position_path:
+            item.setBackground(0, _deselected_base_brush)
+
     def get_item_from_path(self, path):
-        item = self.ui.variableTreeWidget.topLevelItem(0)
-        for subpath in path:
-            # find the item given its name
-            for child_id in range(item.childCount()):
-                if item.child(child_id).text(0) == subpath:
-                    item = item.child(child_id)
-                    break
-        return item
+        if not path:
+            return self.ui.variableTreeWidget.topLevelItem(0)
+        # the path may belong to a previously loaded file
+        return self.variable_tree_nodes.get(tuple(path))
 
     def get_item_path(self, item):
-        path = []
-        while item.parent() is not None:
-            path.append(item.text(0))
-            item = item.parent()
-        path.reverse()
-        return path
+        # the path of the inner nodes is stored when the tree is populated
+        return item.data(0, Qt.UserRole)
+
+    def get_item_key(self, item):
+        # the key of the inner nodes is their path joined with "/"
+        return item.data(0, Qt.UserRole + 1)
 
 
 class Logger:
@@ -883,22 +1009,27 @@ class Logger:
     Logger class shows events during the execution of the viewer.
     """
 
-    def __init__(self, log_widget, scroll_area, add_time=True):
-        # set log widget from main window
+    def __init__(self, log_widget, add_time=True, max_lines=5000):
+        # set log widget (QPlainTextEdit) from main window
         self.log_widget = log_widget
-
-        # set scroll area form main window
-        self.scroll_area = scroll_area
+        # the oldest messages are discarded once max_lines is reached
+        self.log_widget.setMaximumBlockCount(max_lines)
 
         self.add_time = add_time
 
+        # messages waiting to be written in the log widget, together with a flag
+        # telling whether they are formatted as html
+        self._pending_text = []
+
     def write_to_log(self, text, font_color=None, background_color=None):
         """
         Log the text "text" with a timestamp.
+        The messages written in the same event loop iteration are shown in the
+        log widget at once.
         """
 
-        # extract current text from the log widget
-        current_text = self.log_widget.text()
+        # the html formatting is used only for the colored messages
+        is_html = font_color is not None or background_color is not None
 
         if font_color is not None:
             text = '<font color="' + str(font_color) + '">' + text + "</font>"
@@ -916,30 +1047,41 @@ class Logger:
         # convert local time to string
         if self.add_time:
             time_str = strftime(" [%H:%M:%S] ", localtime())
-            #
-            new_text = current_text + time_str + text + "<br>"
-        else:
-            new_text = current_text + text + "<br>"
+            text = time_str + text
+
+        # the widget is updated only once for all the pending messages
+        if not self._pending_text:
+            QTimer.singleShot(0, self.flush)
+        self._pending_text.append((text, is_html))
+
+    def flush(self):
+        """
+        Write the pending messages in the log widget.
+        """
+        if not self._pending_text:
+            return
 
-        # log into the widget
-        self.log_widget.setText(new_text)
+        # every message is appended as a new block, so the text already written
+        # in the widget is neither read back nor parsed again
+        for text, is_html in self._pending_text:
+            if is_html:
+                self.log_widget.appendHtml(text)
+            else:
+                self.log_widget.appendPlainText(text)
+        self._pending_text = []
 
         # scroll down text
         self.scroll_down()
 
     def clean(self):
+        self._pending_text = []
         self.log_widget.clear()
 
     def scroll_down(self):
         """
-        Scroll down the slider of the scroll area
-        linked to this logger
+        Scroll down the log widget
         """
-        # extract scroll bar from the scroll area
-        scroll_bar = self.scroll_area.verticalScrollBar()
-
-        # set maximum value of the slider, 1000 is enough
-        scroll_bar.setMaximum(1000)
+        scroll_bar = self.log_widget.verticalScrollBar()
         scroll_bar.setValue(scroll_bar.maximum())
 
 
@@ -15,19 +15,37 @@ class TextLoggingItem:
         self.table_widget.clear()
 
     def add_entry(self, text, timestamp, font_color=None):
-        item = QTableWidgetItem(text)
-        if font_color is not None:
-            # text = '<font color="' + str(font_color) + '">' + text + "</font>"
-            item.setForeground(QBrush(QColor(font_color)))
-
-        item_timestamp = QTableWidgetItem(f"{timestamp:.2f}")
-        if font_color is not None:
-            # text = '<font color="' + str(font_color) + '">' + text + "</font>"
-            item_timestamp.setForeground(QBrush(QColor(font_color)))
-
-        self.table_widget.insertRow(self.table_widget.rowCount())
-        self.table_widget.setItem(self.table_widget.rowCount() - 1, 0, item_timestamp)
-        self.table_widget.setItem(self.table_widget.rowCount() - 1, 1, item)
+        self.add_entries([text], [timestamp], [font_color])
+
+    def add_entries(self, texts, timestamps, font_colors):
+        # the rows are allocated at once and the table is redrawn only when all
+        # the entries have been added
+        first_row = self.table_widget.rowCount()
+        self.table_widget.setUpdatesEnabled(False)
+        self.table_widget.blockSignals(True)
+        try:
+            self.table_widget.setRowCount(first_row + len(texts))
+
+            # the same brush is shared by all the entries with the same color
+            brushes = {}
+            for row, (text, timestamp, font_color) in enumerate(
+                zip(texts, timestamps, font_colors), first_row
+            ):
+                item = QTableWidgetItem(text)
+                item_timestamp = QTableWidgetItem(f"{timestamp:.2f}")
+                if font_color is not None:
+                    brush = brushes.get(font_color)
+                    if brush is None:
+                        brush = QBrush(QColor(font_color))
+                        brushes[font_color] = brush
+                    item.setForeground(brush)
+                    item_timestamp.setForeground(brush)
+
+                self.table_widget.setItem(row, 0, item_timestamp)
+                self.table_widget.setItem(row, 1, item)
+        finally:
+            self.table_widget.blockSignals(False)
+            self.table_widget.setUpdatesEnabled(True)
 
     def clean(self):
         self.table_widget.setColumnCount(2)
@@ -21,8 +21,16 @@ class VideoItem(QFrame):
 
         self.media_loaded = False
 
+        # duration (in ms) of the media. It is updated by the media player once the
+        # media is loaded, so that it is not queried to the backend at every frame
+        self.duration = 0
+        self.media_player.durationChanged.connect(self.media_player_on_duration_changed)
+
         if os.path.isfile(video_filename):
             self.media_player.setMedia(
                 QMediaContent(QUrl.fromLocalFile(video_filename))
             )
             self.media_loaded = True
+
+    def media_player_on_duration_changed(self, duration):
+        self.duration = duration
@@ -3,6 +3,7 @@
 # Released under the terms of the BSD 3-Clause License
 
 from enum import Enum
+import functools
 
 
 class PeriodicThreadState(Enum):
@@ -35,7 +36,9 @@ class Color:
     def as_normalized_rgb(self):
         return self.get_to_normalized_rgb(self.hex)
 
+    # The palettes contain only a few colors, so the conversions are cached
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def hex_to_rgb(hex):
         # https://stackoverflow.com/questions/29643352/converting-hex-to-rgb-value-in-python
         hex = hex.lstrip("#")
@@ -43,6 +46,7 @@ class Color:
         return tuple(int(hex[i : i + hlen // 3], 16) for i in range(0, hlen, hlen // 3))
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def get_to_normalized_rgb(hex):
         rgb = Color.hex_to_rgb(hex)
         return (rgb[0] / 255.0, rgb[1] / 255.0, rgb[2] / 255.0)